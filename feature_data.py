@@ -92,3 +92,20 @@ FEATURE_DATA = {
         },
     ],
 }
+
+# Element type of the features of each category
+CATEGORY_TYPES = {"vertices": "VERT", "edges": "EDGE", "faces": "FACE"}
+
+# Feature id -> element type, "VERT", "EDGE" or "FACE"
+FEATURE_TYPES = {
+    feature["id"]: CATEGORY_TYPES[category]
+    for category, features in FEATURE_DATA.items()
+    for feature in features
+}
+
+# Feature id -> (enabled property, color property) names, formatted once
+FEATURE_PROPS = {
+    feature["id"]: (f"{feature['id']}_enabled", f"{feature['id']}_color")
+    for features in FEATURE_DATA.values()
+    for feature in features
+}
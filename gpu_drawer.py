@@ -3,15 +3,15 @@
 import bpy
 import gpu
 import logging
+import numpy as np
 
 from gpu_extras.batch import batch_for_shader
-from typing import List, Tuple
-from mathutils import Vector
+from typing import Tuple
 from bpy.types import Object
 
+from .feature_data import FEATURE_PROPS, FEATURE_TYPES
 from .mesh_analyzer import MeshAnalyzer
 
-
 logger = logging.getLogger(__name__)
 # logger.setLevel(logging.DEBUG)
 logger.propagate = False
@@ -23,16 +23,25 @@ if not logger.handlers:
     logger.addHandler(handler)
 
 
+# Vertices per element of the indexed primitive types
+PRIMITIVE_SIZES = {"LINES": 2, "TRIS": 3}
+
+# Element type -> GPU primitive type, in drawing order
+PRIMITIVE_TYPES = {"FACE": "TRIS", "EDGE": "LINES", "VERT": "POINTS"}
+
+
 class GPUDrawer:
     def __init__(self):
         logger.debug("=== GPUDrawer Initialization ===")
-        self.shader = gpu.shader.from_builtin("FLAT_COLOR")
+        self.shader = gpu.shader.from_builtin("UNIFORM_COLOR")
         self.batches = {}
         self.next_batches = {}
         self.pending_updates = {}  # Store vertex/color data before creating batch
         self.is_running = False
         self._handle = None
         self._current_analyzer = None
+        self._world_verts = None  # Offset world positions, shared by all features
+        self._dirty = True  # Batches must be rebuilt on the next draw
         logger.debug(f"Initial state:")
         logger.debug(f"- Is running: {self.is_running}")
         logger.debug(f"- Handle: {self._handle}")
@@ -45,11 +54,12 @@ class GPUDrawer:
     def update_feature_batch(
         self,
         feature: str,
-        indices: List[int],
+        indices: np.ndarray,
         color: Tuple[float, float, float, float],
         primitive_type: str,
     ):
-        if not indices:
+        if not len(indices):
+            self.pending_updates.pop(feature, None)
             return
 
         try:
@@ -62,67 +72,43 @@ class GPUDrawer:
                 self.next_batches.clear()
                 self.pending_updates.clear()
                 MeshAnalyzer._cache.clear()  # Clear analyzer cache too
+                self._dirty = True
                 return
 
-            world_matrix = obj.matrix_world
-            world_normal_matrix = world_matrix.inverted().transposed().to_3x3()
-
-            # Calculate vertex positions and normals
-            verts = []
-            normals = []
-
-            props = bpy.context.scene.Mesh_Analysis_Overlay_Properties
-            offset = props.overlay_offset
-
-            def process_vertex(v_idx):
-                v = mesh.vertices[v_idx]
-                pos = world_matrix @ v.co
-                normal = (world_normal_matrix @ v.normal).normalized()
-                offset_pos = pos + (normal * offset)
-                verts.append(offset_pos)
-                normals.append(normal)
-
+            # Collect the mesh vertex index of every output vertex
             if primitive_type == "POINTS":
                 # Handle vertices
-                for idx in indices:
-                    process_vertex(idx)
+                vert_indices = indices
 
             elif primitive_type == "LINES":
                 # Handle edges
-                for idx in indices:
-                    e = mesh.edges[idx]
-                    for v_idx in e.vertices:
-                        process_vertex(v_idx)
+                edge_verts = self._current_analyzer.get_mesh_array(
+                    "edges", "vertices", np.int32, 2
+                )
+                vert_indices = edge_verts[indices].ravel()
 
             elif primitive_type == "TRIS":
                 # Handle faces
-                for idx in indices:
-                    f = mesh.polygons[idx]
-                    verts_count = len(f.vertices)
-
-                    if verts_count == 3:
-                        # Regular triangle
-                        for v_idx in f.vertices:
-                            process_vertex(v_idx)
-                    else:
-                        # Fan triangulation for quads and n-gons
-                        v0 = f.vertices[0]  # First vertex is the fan center
-                        for i in range(1, verts_count - 1):
-                            # Create triangle: v0, vi, vi+1
-                            process_vertex(v0)
-                            process_vertex(f.vertices[i])
-                            process_vertex(f.vertices[i + 1])
-
-            # Append to pending updates
-            if feature not in self.pending_updates:
-                self.pending_updates[feature] = {
-                    "verts": [],
-                    "colors": [],
-                    "primitive_type": primitive_type,
-                }
-
-            self.pending_updates[feature]["verts"].extend(verts)
-            self.pending_updates[feature]["colors"].extend([color] * len(verts))
+                vert_indices = self._triangulate_faces(indices)
+
+            # Upload every used mesh vertex once, lines and triangles index
+            # into them instead of repeating the vertices they share
+            if primitive_type == "POINTS":
+                used, elements = vert_indices, None
+            else:
+                used, elements = np.unique(vert_indices, return_inverse=True)
+                elements = elements.astype(np.int32).reshape(
+                    -1, PRIMITIVE_SIZES[primitive_type]
+                )
+            verts = self._get_world_verts()[used]
+
+            # Replace any pending data, the color is a uniform of the whole batch
+            self.pending_updates[feature] = {
+                "verts": verts,
+                "color": color,
+                "indices": elements,
+                "primitive_type": primitive_type,
+            }
 
         except (AttributeError, IndexError, ReferenceError):
             # Clear all caches on error
@@ -130,8 +116,56 @@ class GPUDrawer:
             self.next_batches.clear()
             self.pending_updates.clear()
             MeshAnalyzer._cache.clear()
+            self._dirty = True
             return
 
+    def update_colors(self, props):
+        """Colors are uniforms of the batches, refresh them without a rebuild"""
+        for feature, data in self.batches.items():
+            data["color"] = tuple(getattr(props, FEATURE_PROPS[feature][1]))
+        for feature, data in self.pending_updates.items():
+            data["color"] = tuple(getattr(props, FEATURE_PROPS[feature][1]))
+
+    def _get_world_verts(self) -> np.ndarray:
+        """World space vertex positions pushed along their normals by the overlay
+        offset, computed once per batch update and shared by every feature"""
+        if self._world_verts is not None:
+            return self._world_verts
+
+        obj = self._current_analyzer.obj
+        mesh = obj.data
+
+        # World and normal matrices as float32 arrays
+        world_matrix = np.array(obj.matrix_world, dtype=np.float32)
+        normal_matrix = np.array(
+            obj.matrix_world.inverted().transposed().to_3x3(), dtype=np.float32
+        )
+        offset = bpy.context.scene.Mesh_Analysis_Overlay_Properties.overlay_offset
+
+        # Read fresh so edits show up even while the topology is unchanged
+        coords = np.empty((len(mesh.vertices), 3), dtype=np.float32)
+        mesh.vertices.foreach_get("co", coords.ravel())
+        normals = np.empty((len(mesh.vertices), 3), dtype=np.float32)
+        mesh.vertices.foreach_get("normal", normals.ravel())
+
+        # Scale the world normals straight to the offset length, in place
+        normals = normals @ normal_matrix.T
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals *= offset / lengths.clip(min=1e-20)  # Loose vertices have no normal
+
+        positions = coords @ world_matrix[:3, :3].T
+        positions += world_matrix[:3, 3]
+        positions += normals
+        self._world_verts = positions
+        return self._world_verts
+
+    def _triangulate_faces(self, indices: np.ndarray) -> np.ndarray:
+        """Mesh vertex indices of the given faces as a flat triangle list"""
+        tri_verts, tri_faces = self._current_analyzer.get_loop_triangles()
+        face_mask = np.zeros(len(self._current_analyzer.obj.data.polygons), bool)
+        face_mask[indices] = True
+        return tri_verts[face_mask[tri_faces]].ravel()
+
     def draw(self):
         if not self.is_running:
             return
@@ -142,84 +176,68 @@ class GPUDrawer:
                 batch = batch_for_shader(
                     self.shader,
                     data["primitive_type"],
-                    {
-                        "pos": data["verts"],
-                        "color": data["colors"],
-                    },
+                    {"pos": data["verts"]},
+                    indices=data["indices"],
                 )
-                self.next_batches[feature] = {"batch": batch}
+                self.next_batches[feature] = {"batch": batch, "color": data["color"]}
             except Exception as e:
-                logger.debug(f"[ERROR] Failed to create batch: {str(e)}")
+                logger.debug("[ERROR] Failed to create batch: %s", e)
 
         self.pending_updates.clear()
 
-        # Swap buffers if we have pending updates
+        # Merge the rebuilt batches, partial updates keep the other features'
+        # batches and full updates already cleared them
         if self.next_batches:
-            self.batches = self.next_batches
-            self.next_batches = {}
+            self.batches.update(self.next_batches)
+            self.next_batches.clear()
 
         obj = bpy.context.active_object
         if not obj or obj.type != "MESH":
             return
 
-        # Set GPU state
-        gpu.state.blend_set("ALPHA")
-        gpu.state.depth_test_set("LESS_EQUAL")
-        gpu.state.face_culling_set("BACK")
-        gpu.state.point_size_set(
-            bpy.context.scene.Mesh_Analysis_Overlay_Properties.overlay_vertex_radius
-        )
-        gpu.state.line_width_set(
-            bpy.context.scene.Mesh_Analysis_Overlay_Properties.overlay_edge_width
-        )
-
         # logger.debug("\n=== Draw Call ===")
         # logger.debug(f"Object: {obj.name}")
         # logger.debug(f"Batch count: {len(self.batches)}")
 
+        # Batches are rebuilt by the handlers when something changes, only
+        # rebuild here after a failed update or when the active object changed
         if (
-            not self.batches
+            self._dirty
             or self._current_analyzer is None
             or self._current_analyzer.obj != obj
         ):
             # logger.debug("Forcing batch update...")
             self.update_batches(obj)
 
+        # Nothing enabled or found, skip the GPU state changes
+        if not self.batches:
+            return
+
+        # Set GPU state
+        props = bpy.context.scene.Mesh_Analysis_Overlay_Properties
+        gpu.state.blend_set("ALPHA")
+        gpu.state.depth_test_set("LESS_EQUAL")
+        gpu.state.face_culling_set("BACK")
+        gpu.state.point_size_set(props.overlay_vertex_radius)
+        gpu.state.line_width_set(props.overlay_edge_width)
+
         # logger.debug("Drawing batches...")
         self.shader.bind()
         for feature, batch_data in self.batches.items():
             # logger.debug(f"- Drawing {feature}")
+            self.shader.uniform_float("color", batch_data["color"])
             batch_data["batch"].draw(self.shader)
 
         # Reset GPU state
         gpu.state.blend_set("NONE")
         gpu.state.face_culling_set("NONE")
 
-    def _update_feature_set(self, feature_set, primitive_type, props, analyzer):
-        for feature in feature_set:
-            if not getattr(props, f"{feature}_enabled", False):
-                continue
-
-            # Use MeshCache's feature sets to validate feature type
-            if (
-                (
-                    primitive_type == "TRIS"
-                    and feature in MeshAnalyzer._cache.face_features
-                )
-                or (
-                    primitive_type == "LINES"
-                    and feature in MeshAnalyzer._cache.edge_features
-                )
-                or (
-                    primitive_type == "POINTS"
-                    and feature in MeshAnalyzer._cache.vertex_features
-                )
-            ):
-
-                indices = analyzer.analyze_feature(feature)
-                if indices:
-                    color = tuple(getattr(props, f"{feature}_color"))
-                    self.update_feature_batch(feature, indices, color, primitive_type)
+    def _update_feature_set(self, features, primitive_type, props, analyzer):
+        for feature in features:
+            indices = analyzer.analyze_feature(feature)
+            if len(indices):
+                color = tuple(getattr(props, FEATURE_PROPS[feature][1]))
+                self.update_feature_batch(feature, indices, color, primitive_type)
 
     def _update_all_batches(self, obj):
         if not obj or not self.is_running:
@@ -227,16 +245,20 @@ class GPUDrawer:
 
         props = bpy.context.scene.Mesh_Analysis_Overlay_Properties
         analyzer = self._get_analyzer(obj)
+        self._world_verts = None
         self.batches.clear()
+        self.next_batches.clear()
+        self.pending_updates.clear()
 
-        feature_configs = [
-            (MeshAnalyzer._cache.face_features, "TRIS"),
-            (MeshAnalyzer._cache.edge_features, "LINES"),
-            (MeshAnalyzer._cache.vertex_features, "POINTS"),
-        ]
+        # Only analyze enabled overlays, skipping whole element types
+        enabled = {primitive_type: [] for primitive_type in PRIMITIVE_TYPES.values()}
+        for feature, element_type in FEATURE_TYPES.items():
+            if getattr(props, FEATURE_PROPS[feature][0], False):
+                enabled[PRIMITIVE_TYPES[element_type]].append(feature)
 
-        for feature_set, primitive_type in feature_configs:
-            self._update_feature_set(feature_set, primitive_type, props, analyzer)
+        for primitive_type, features in enabled.items():
+            if features:
+                self._update_feature_set(features, primitive_type, props, analyzer)
 
     def _handle_mode_change(self, obj):
         if not obj or not self.is_running:
@@ -247,7 +269,7 @@ class GPUDrawer:
         # 2. Entering object mode
         # 3. Switching between edit/object modes
         if obj.mode in {"OBJECT", "EDIT"}:
-            logger.debug(f"[DEBUG] Mode change detected: {obj.mode}")
+            logger.debug("[DEBUG] Mode change detected: %s", obj.mode)
             self._update_all_batches(obj)
             return True
         return False
@@ -286,23 +308,21 @@ class GPUDrawer:
 
         logger.debug("Cleaning up...")
         self.batches.clear()
+        self.next_batches.clear()
+        self.pending_updates.clear()
         self._current_analyzer = None
+        self._world_verts = None
+        self._dirty = True
         # MeshAnalyzer._cache.clear()  # Changed from clear_analyzer_cache() to _cache.clear()
         logger.debug("Cleanup complete")
 
     def get_primitive_type(self, feature: str) -> str:
-        if feature in MeshAnalyzer._cache.face_features:
-            return "TRIS"
-        elif feature in MeshAnalyzer._cache.edge_features:
-            return "LINES"
-        elif feature in MeshAnalyzer._cache.vertex_features:
-            return "POINTS"
-        return None
+        return PRIMITIVE_TYPES.get(FEATURE_TYPES.get(feature))
 
     def update_batches(self, obj, features=None):
         logger.debug("\n=== Update Batches ===")
-        logger.debug(f"Object: {obj.name if obj else 'None'}")
-        logger.debug(f"Updating features: {features if features else 'all'}")
+        logger.debug("Object: %s", obj.name if obj else "None")
+        logger.debug("Updating features: %s", features if features else "all")
 
         if not obj or not self.is_running:
             logger.debug("× Skipping update - invalid state")
@@ -310,6 +330,8 @@ class GPUDrawer:
 
         analyzer = self._get_analyzer(obj)
         props = bpy.context.scene.Mesh_Analysis_Overlay_Properties
+        self._world_verts = None
+        self._dirty = False
 
         if not features:
             # Full update - clear all batches and update everything
@@ -321,12 +343,13 @@ class GPUDrawer:
                     del self.batches[feature]
                 if feature in self.next_batches:
                     del self.next_batches[feature]
+                self.pending_updates.pop(feature, None)
 
                 # Only update the specified feature
-                if getattr(props, f"{feature}_enabled", False):
+                if getattr(props, FEATURE_PROPS[feature][0], False):
                     indices = analyzer.analyze_feature(feature)
-                    if indices:
-                        color = tuple(getattr(props, f"{feature}_color"))
+                    if len(indices):
+                        color = tuple(getattr(props, FEATURE_PROPS[feature][1]))
                         primitive_type = self.get_primitive_type(feature)
                         self.update_feature_batch(
                             feature, indices, color, primitive_type
@@ -4,7 +4,7 @@ import bmesh
 
 from bpy.app.handlers import persistent
 from .mesh_analyzer import MeshAnalyzer
-from .operators import drawer
+from .operators import get_drawer, is_drawer_running, tag_view3d_redraw
 from .panels import Mesh_Analysis_Overlay_Panel
 
 logger = logging.getLogger(__name__)
@@ -23,8 +23,6 @@ if not logger.handlers:
 def update_analysis_overlay(scene, depsgraph):
     if bpy.context.mode == "EDIT_MESH":
         return
-    if not drawer or not drawer.is_running:
-        return
     logger.debug("\n=== Depsgraph Update Handler ===")
 
     # Get evaluated depsgraph objects
@@ -32,78 +30,125 @@ def update_analysis_overlay(scene, depsgraph):
         # Check if update is for a mesh object
         if isinstance(update.id, bpy.types.Object) and update.id.type == "MESH":
             obj = update.id
-            logger.debug(f"Object updated: {obj.name} ({obj.type})")
-            logger.debug(f"Geometry updated: {update.is_updated_geometry}")
+            logger.debug("Object updated: %s (%s)", obj.name, obj.type)
+            logger.debug("Geometry updated: %s", update.is_updated_geometry)
 
             if obj.type == "MESH" and update.is_updated_geometry:
-                # Clear statistics cache when geometry changes
-                Mesh_Analysis_Overlay_Panel.clear_stats_cache()
-                logger.debug(f"Updating drawer batches for features")
-                drawer.update_batches(obj)
+                # Clear cached results when geometry changes, coordinates may
+                # have moved without changing the topology. Done even while the
+                # overlay is off, so cached results can be reused as is when it
+                # is toggled back on
+                MeshAnalyzer.invalidate_cache(obj.name)
+                if is_drawer_running():
+                    # Looked up by name, so the original object is analyzed
+                    # rather than this evaluated copy
+                    logger.debug("Queueing drawer batch update")
+                    queue_batch_update(obj)
+
+            elif update.is_updated_transform and is_drawer_running():
+                # Batches are in world space, rebuild them from the cached
+                # results, coalesced to at most one rebuild per timer tick
+                active_object = bpy.context.active_object
+                if active_object and active_object.name == obj.name:
+                    queue_batch_update(obj)
+
+
+# {obj_name: features to rebuild, or None for all}, flushed by a timer so
+# several property updates in a row cause a single batch rebuild
+_pending_batch_updates = {}
+
+
+def queue_batch_update(obj, features=None):
+    """Schedule a batch rebuild of the given features of the object"""
+    if obj.name in _pending_batch_updates:
+        queued = _pending_batch_updates[obj.name]
+        if queued is None or features is None:
+            features = None
+        else:
+            features = queued | set(features)
+    elif features is not None:
+        features = set(features)
+    _pending_batch_updates[obj.name] = features
+
+    if not bpy.app.timers.is_registered(_flush_batch_updates):
+        bpy.app.timers.register(_flush_batch_updates, first_interval=0.0)
+
+
+def _flush_batch_updates():
+    """Timer running the queued batch rebuilds once"""
+    pending = list(_pending_batch_updates.items())
+    _pending_batch_updates.clear()
+    if not is_drawer_running():
+        return None
+
+    for obj_name, features in pending:
+        obj = bpy.data.objects.get(obj_name)
+        if obj and obj.type == "MESH":
+            get_drawer().update_batches(obj, list(features) if features else None)
+
+    tag_view3d_redraw()
+    return None
 
 
 # Used as a callback for property updates in properties.py
 def update_overlay_enabled_toggles(self, context):
-    if not drawer or not drawer.is_running:
+    if not is_drawer_running():
         return
     logger.debug("\n=== Toggle Enabled Update Handler ===")
-    # if context and context.active_object:
-    # logger.debug(f"Active object: {context.active_object.name}")
-
     if context and context.active_object:
         obj = context.active_object
-    if obj and obj.type == "MESH":
-        # Clear statistics cache when features are toggled
-        Mesh_Analysis_Overlay_Panel.clear_stats_cache()
-        drawer.update_batches(obj)
-    # if context and context.area:
-    #     context.area.tag_redraw()
+        if obj and obj.type == "MESH":
+            # Statistics are keyed by the enabled features, no need to clear them
+            queue_batch_update(obj)
+
+
+# Used as a callback for color property updates in properties.py
+def update_overlay_color(self, context):
+    """Colors are shader uniforms, update them in place and redraw"""
+    if not is_drawer_running():
+        return
+    logger.debug("\n=== Color Update Handler ===")
+    get_drawer().update_colors(self)
+    tag_view3d_redraw()
 
 
 # Used as a callback for offset property updates in properties.py
 def update_overlay_offset(self, context):
     """Callback for when offset property changes"""
-    if not drawer or not drawer.is_running:
+    if not is_drawer_running():
         return
     logger.debug("\n=== Offset Update Handler ===")
     if context and context.active_object:
         obj = context.active_object
         if obj and obj.type == "MESH":
-            drawer.update_batches(obj)
-    # if context and context.area:
-    #     context.area.tag_redraw()
+            queue_batch_update(obj)
 
 
 def update_non_planar_threshold(self, context):
     """Specific handler for non-planar threshold updates"""
-    if not drawer or not drawer.is_running:
-        return
-
     logger.debug("\n=== Non-Planar Threshold Update Handler ===")
-    if context and context.active_object:
+    # The threshold is shared by every object. Invalidated even while the
+    # overlay is off, so stale results are not drawn when it is toggled back on
+    for obj_name in MeshAnalyzer._cache.names():
+        MeshAnalyzer.invalidate_cache(obj_name, ["non_planar_faces"])
+
+    if is_drawer_running() and context and context.active_object:
         obj = context.active_object
         if obj and obj.type == "MESH":
-            MeshAnalyzer.invalidate_cache(obj.name, ["non_planar_faces"])
-            drawer.update_batches(obj, ["non_planar_faces"])
-    # if context and context.area:
-    #     context.area.tag_redraw()
+            queue_batch_update(obj, ["non_planar_faces"])
 
 
-@bpy.app.handlers.depsgraph_update_post.append
+@persistent
 def update_mesh_analysis_stats(scene, depsgraph):
-    # Only process if there are updates to objects
-    if not depsgraph.updates:
-        return
-
-    # Check for relevant mesh updates
+    """Drop the statistics of meshes whose geometry changed, keeping the
+    counts of every other mesh"""
     for update in depsgraph.updates:
         if (
-            isinstance(update.id, bpy.types.Object)
+            update.is_updated_geometry
+            and isinstance(update.id, bpy.types.Object)
             and update.id.type == "MESH"
-            and update.id.name in Mesh_Analysis_Overlay_Panel._stats_cache
         ):
-            # Clear cache for this object to force recalculation
-            del Mesh_Analysis_Overlay_Panel._stats_cache[update.id.name]
+            Mesh_Analysis_Overlay_Panel._stats_cache.pop(update.id.data.name, None)
 
 
 @persistent
@@ -133,8 +178,8 @@ def handle_edit_mode_changes(scene, depsgraph):
         ):
             Mesh_Analysis_Overlay_Panel.clear_stats_cache()
             MeshAnalyzer.invalidate_cache(obj.name)
-            if drawer and drawer.is_running:
-                drawer.update_batches(obj)
+            if is_drawer_running():
+                get_drawer().update_batches(obj)
 
         # Update cached stats
         analyzer.mesh_stats = {
@@ -144,15 +189,28 @@ def handle_edit_mode_changes(scene, depsgraph):
         }
 
 
+@persistent
+def clear_caches_on_load(dummy):
+    """Cached statistics and analyzers refer to objects of the previous file"""
+    Mesh_Analysis_Overlay_Panel.clear_stats_cache()
+    MeshAnalyzer._cache.clear()
+
+
 def register():
     logger.debug("\n=== Registering Handlers ===")
     bpy.app.handlers.depsgraph_update_post.append(update_analysis_overlay)
+    bpy.app.handlers.load_post.append(clear_caches_on_load)
     if update_mesh_analysis_stats not in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.append(update_mesh_analysis_stats)
 
 
 def unregister():
     logger.debug("\n=== Unregistering Handlers ===")
+    if bpy.app.timers.is_registered(_flush_batch_updates):
+        bpy.app.timers.unregister(_flush_batch_updates)
+    _pending_batch_updates.clear()
+    if clear_caches_on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_caches_on_load)
     if update_analysis_overlay in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.remove(update_analysis_overlay)
     if update_mesh_analysis_stats in bpy.app.handlers.depsgraph_update_post:
@@ -1,14 +1,15 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import bpy
-import bmesh
 import logging
 import math
+import numpy as np
 
+from collections import OrderedDict
 from typing import List, Optional
 from bpy.types import Object
 
-from .feature_data import FEATURE_DATA
+from .feature_data import FEATURE_TYPES
 
 logger = logging.getLogger(__name__)
 # logger.setLevel(logging.DEBUG)
@@ -21,44 +22,72 @@ if not logger.handlers:
     logger.addHandler(handler)
 
 
+# Edge flag bits, packed into a single uint8 per edge
+_EDGE_MANIFOLD = 1 << 0
+_EDGE_SMOOTH = 1 << 1
+_EDGE_SEAM = 1 << 2
+_EDGE_BOUNDARY = 1 << 3
+
+# Vertex feature -> test on the number of edges linked to each vertex
+_DEGREE_TESTS = {
+    "single_vertices": lambda degree: degree == 0,
+    "n_pole_vertices": lambda degree: degree == 3,
+    "e_pole_vertices": lambda degree: degree == 5,
+    "high_pole_vertices": lambda degree: degree >= 6,
+}
+
+# Face feature -> test on the number of vertices of each face
+_FACE_SIZE_FEATURES = {
+    "tri_faces": lambda loop_total: loop_total == 3,
+    "quad_faces": lambda loop_total: loop_total == 4,
+    "ngon_faces": lambda loop_total: loop_total > 4,
+}
+
+# Vertex coordinate viewed as one record, so points sort lexicographically
+_POINT_DTYPE = np.dtype([("x", np.float32), ("y", np.float32), ("z", np.float32)])
+
+# Edge feature -> (flag bit, value the bit must have)
+_EDGE_FEATURE_FLAGS = {
+    "non_manifold_e_edges": (_EDGE_MANIFOLD, 0),
+    "sharp_edges": (_EDGE_SMOOTH, 0),
+    "seam_edges": (_EDGE_SEAM, _EDGE_SEAM),
+    "boundary_edges": (_EDGE_BOUNDARY, _EDGE_BOUNDARY),
+}
+
+
 class MeshAnalyzerCache:
     def __init__(self, max_size=2):
         self.max_size = max_size
-        self._analyzers = {}  # {obj_name: (analyzer, feature_results)}
-        self._access_order = []  # LRU queue
-
-        # Feature type definitions from feature_data
-        self.vertex_features = {feature["id"] for feature in FEATURE_DATA["vertices"]}
-        self.edge_features = {feature["id"] for feature in FEATURE_DATA["edges"]}
-        self.face_features = {feature["id"] for feature in FEATURE_DATA["faces"]}
+        # {obj_name: (analyzer, feature_results)}, ordered from least to most recently used
+        self._analyzers = OrderedDict()
 
     def get(self, obj_name: str) -> tuple[Optional["MeshAnalyzer"], dict]:
         """Get analyzer and its results from cache"""
         if obj_name in self._analyzers:
             # Move to most recently used
-            self._access_order.remove(obj_name)
-            self._access_order.append(obj_name)
+            self._analyzers.move_to_end(obj_name)
             return self._analyzers[obj_name]
         return None, {}
 
     def put(self, obj_name: str, analyzer: "MeshAnalyzer", feature_results: dict):
         """Add or update cache entry"""
         if obj_name in self._analyzers:
-            self._access_order.remove(obj_name)
+            self._analyzers.move_to_end(obj_name)
         elif len(self._analyzers) >= self.max_size:
             # Evict least recently used
-            lru_name = self._access_order.pop(0)
-            del self._analyzers[lru_name]
-            logger.debug(f"Evicting analyzer for: {lru_name}")
+            lru_name, _ = self._analyzers.popitem(last=False)
+            logger.debug("Evicting analyzer for: %s", lru_name)
 
         self._analyzers[obj_name] = (analyzer, feature_results)
-        self._access_order.append(obj_name)
-        logger.debug(f"\nCache state: {self._access_order}")
+        logger.debug("\nCache state: %s", self._analyzers.keys())
+
+    def names(self) -> List[str]:
+        """Names of the cached objects"""
+        return list(self._analyzers)
 
     def clear(self):
         """Clear all cache entries"""
         self._analyzers.clear()
-        self._access_order.clear()
 
 
 class MeshAnalyzer:
@@ -72,26 +101,54 @@ class MeshAnalyzer:
         self.scene_props = bpy.context.scene.Mesh_Analysis_Overlay_Properties
         self.analyzed_features = {}
         self.mesh_stats = {"verts": 0, "edges": 0, "faces": 0}  # Add mesh stats
+        self.mesh_sig = self._mesh_sig(obj)
+        self._mesh_arrays = {}  # Cached foreach_get data, reset with the results
+
+    @staticmethod
+    def _mesh_sig(obj: Object) -> tuple:
+        """Cheap signature of the object, its mesh datablock and topology, used to
+        detect stale results when the object is replaced by one with the same
+        name, gets a new mesh or elements are added/removed"""
+        mesh = obj.data
+        return (
+            obj.as_pointer(),
+            mesh.as_pointer(),
+            len(mesh.vertices),
+            len(mesh.edges),
+            len(mesh.polygons),
+        )
 
     @classmethod
     def get_analyzer(cls, obj: Object) -> "MeshAnalyzer":
+        # Always analyze the original object, never an evaluated copy with
+        # its modifiers applied
+        obj = obj.original
         analyzer, features = cls._cache.get(obj.name)
         if analyzer:
             # logger.debug(f"Cache hit for {obj.name}")
+            mesh_sig = cls._mesh_sig(obj)
+            # The cached reference may be of a deleted object of that name
+            analyzer.obj = obj
             analyzer.analyzed_features = features
+            if mesh_sig != analyzer.mesh_sig:
+                # Object, mesh or topology changed since the results were cached
+                logger.debug("Mesh signature changed for %s", obj.name)
+                analyzer.analyzed_features.clear()
+                analyzer._mesh_arrays.clear()
+                analyzer.mesh_sig = mesh_sig
             return analyzer
 
         analyzer = cls(obj)
         cls._cache.put(obj.name, analyzer, {})
         return analyzer
 
-    def analyze_feature(self, feature: str) -> List:
+    def analyze_feature(self, feature: str) -> np.ndarray:
         try:
             if feature in self.analyzed_features:
-                logger.debug(f"Feature cache hit: {feature}")
+                logger.debug("Feature cache hit: %s", feature)
                 return self.analyzed_features[feature]
 
-            logger.debug(f"Feature cache miss: {feature}")
+            logger.debug("Feature cache miss: %s", feature)
             indices = self._analyze_feature_impl(feature)
             self.analyzed_features[feature] = indices
             # Update cache with new feature results
@@ -101,135 +158,246 @@ class MeshAnalyzer:
             # Object reference became invalid (e.g. during undo)
             logger.debug("Object reference invalid - clearing cache")
             self._cache.clear()
-            return []
+            return np.empty(0, dtype=np.int64)
 
-    def _analyze_feature_impl(self, feature: str) -> List:
-        bm = bmesh.new()
-        bm.from_mesh(self.obj.data)
-        bm.edges.ensure_lookup_table()
-        bm.faces.ensure_lookup_table()
-        bm.verts.ensure_lookup_table()
+    def _analyze_feature_impl(self, feature: str) -> np.ndarray:
+        mesh = self.obj.data
 
         # Store mesh stats
         self.mesh_stats = {
-            "verts": len(bm.verts),
-            "edges": len(bm.edges),
-            "faces": len(bm.faces),
+            "verts": len(mesh.vertices),
+            "edges": len(mesh.edges),
+            "faces": len(mesh.polygons),
         }
 
-        indices = []
-
-        if feature in self._cache.vertex_features:
-            self._analyze_vertex_feature(bm, feature, indices)
-        elif feature in self._cache.edge_features:
-            self._analyze_edge_feature(bm, feature, indices)
-        elif feature in self._cache.face_features:
-            self._analyze_face_feature(bm, feature, indices)
-
-        bm.free()
-        return indices
-
-    def _analyze_vertex_feature(
-        self, bm: bmesh.types.BMesh, feature: str, indices: List
-    ):
-        for v in bm.verts:
-            if feature == "single_vertices" and len(v.link_edges) == 0:
-                indices.append(v.index)
-            elif feature == "non_manifold_v_vertices" and not v.is_manifold:
-                indices.append(v.index)
-            elif feature == "n_pole_vertices" and len(v.link_edges) == 3:
-                indices.append(v.index)
-            elif feature == "e_pole_vertices" and len(v.link_edges) == 5:
-                indices.append(v.index)
-            elif feature == "high_pole_vertices" and len(v.link_edges) >= 6:
-                indices.append(v.index)
-
-    def _analyze_edge_feature(self, bm: bmesh.types.BMesh, feature: str, indices: List):
-        for e in bm.edges:
-            if feature == "non_manifold_e_edges" and not e.is_manifold:
-                indices.append(e.index)  # Changed from extend to append
-            elif feature == "sharp_edges" and e.smooth is False:
-                indices.append(e.index)  # Changed from extend to append
-            elif feature == "seam_edges" and e.seam:
-                indices.append(e.index)  # Changed from extend to append
-            elif feature == "boundary_edges" and e.is_boundary:
-                indices.append(e.index)  # Changed from extend to append
-
-    def _analyze_face_feature(self, bm: bmesh.types.BMesh, feature: str, indices: List):
-        for f in bm.faces:
-            if feature == "tri_faces" and len(f.verts) == 3:
-                indices.append(f.index)
-            elif feature == "quad_faces" and len(f.verts) == 4:
-                indices.append(f.index)
-            elif feature == "ngon_faces" and len(f.verts) > 4:
-                indices.append(f.index)
-            elif feature == "non_planar_faces" and not self._is_planar(f):
-                indices.append(f.index)
-            elif feature == "degenerate_faces" and self._is_degenerate(f):
-                indices.append(f.index)
-
-    def _is_planar(self, face: bmesh.types.BMFace) -> bool:
-        if len(face.verts) <= 3:
-            return True
-
+        return self._analyze_mesh_feature(feature)
+
+    def get_mesh_array(self, collection: str, attr: str, dtype, width: int = 1):
+        """Read a mesh attribute with foreach_get, cached until invalidation"""
+        key = (collection, attr)
+        if key not in self._mesh_arrays:
+            items = getattr(self.obj.data, collection)
+            data = np.empty(len(items) * width, dtype=dtype)
+            items.foreach_get(attr, data)
+            self._mesh_arrays[key] = data.reshape(-1, width) if width > 1 else data
+        return self._mesh_arrays[key]
+
+    def _analyze_mesh_feature(self, feature: str) -> np.ndarray:
+        """Analyze features that don't need a BMesh using foreach_get data"""
+        analyze = self._MESH_FEATURE_DISPATCH.get(feature)
+        if analyze is None:
+            return np.empty(0, dtype=np.int64)
+        return analyze(self, feature)
+
+    def _analyze_face_size_feature(self, feature: str) -> np.ndarray:
+        return np.flatnonzero(self._get_face_size_masks()[feature])
+
+    def _analyze_degree_feature(self, feature: str) -> np.ndarray:
+        return np.flatnonzero(_DEGREE_TESTS[feature](self._get_vertex_degree()))
+
+    def _get_face_size_masks(self) -> dict:
+        """Triangle, quad and n-gon face masks, computed together and cached"""
+        if "face_size_masks" not in self._mesh_arrays:
+            loop_total = self.get_mesh_array("polygons", "loop_total", np.int32)
+            self._mesh_arrays["face_size_masks"] = {
+                feature: test(loop_total)
+                for feature, test in _FACE_SIZE_FEATURES.items()
+            }
+        return self._mesh_arrays["face_size_masks"]
+
+    def get_loop_triangles(self) -> tuple[np.ndarray, np.ndarray]:
+        """Blender's triangulation of every face as (triangle vertex indices,
+        face index of each triangle), shared by all face features. Unlike a
+        fan it stays inside concave n-gons"""
+        if ("loop_triangles", "vertices") not in self._mesh_arrays:
+            self.obj.data.calc_loop_triangles()
+        return (
+            self.get_mesh_array("loop_triangles", "vertices", np.int32, 3),
+            self.get_mesh_array("loop_triangles", "polygon_index", np.int32),
+        )
+
+    def _get_vertex_degree(self) -> np.ndarray:
+        """Number of edges connected to each vertex"""
+        if "vert_degree" not in self._mesh_arrays:
+            edge_verts = self.get_mesh_array("edges", "vertices", np.int32, 2)
+            self._mesh_arrays["vert_degree"] = np.bincount(
+                edge_verts.ravel(), minlength=len(self.obj.data.vertices)
+            )
+        return self._mesh_arrays["vert_degree"]
+
+    def _get_edge_flags(self) -> np.ndarray:
+        """Per-edge packed manifold/smooth/seam/boundary bits, read via foreach_get"""
+        if "edge_flags" in self._mesh_arrays:
+            return self._mesh_arrays["edge_flags"]
+
+        num_edges = len(self.obj.data.edges)
+        face_count = self._get_edge_face_count()
+
+        sharp = self.get_mesh_array("edges", "use_edge_sharp", bool)
+        seam = self.get_mesh_array("edges", "use_seam", bool)
+
+        flags = np.zeros(num_edges, dtype=np.uint8)
+        flags[face_count == 2] |= _EDGE_MANIFOLD
+        flags[~sharp] |= _EDGE_SMOOTH
+        flags[seam] |= _EDGE_SEAM
+        flags[face_count == 1] |= _EDGE_BOUNDARY
+
+        self._mesh_arrays["edge_flags"] = flags
+        return flags
+
+    def _get_edge_face_count(self) -> np.ndarray:
+        """Number of faces using each edge"""
+        if "edge_face_count" not in self._mesh_arrays:
+            loop_edges = self.get_mesh_array("loops", "edge_index", np.int32)
+            self._mesh_arrays["edge_face_count"] = np.bincount(
+                loop_edges, minlength=len(self.obj.data.edges)
+            )
+        return self._mesh_arrays["edge_face_count"]
+
+    def _analyze_edge_feature(self, feature: str) -> np.ndarray:
+        bit, value = _EDGE_FEATURE_FLAGS[feature]
+        flags = self._get_edge_flags()
+        return np.flatnonzero((flags & bit) == value)
+
+    def _find_non_planar_faces(self) -> np.ndarray:
+        """Indices of faces with a vertex deviating from the face plane"""
         props = bpy.context.scene.Mesh_Analysis_Overlay_Properties
         # Convert degrees to radians for math operations
         threshold_rad = math.radians(props.non_planar_threshold)
 
-        normal = face.normal.normalized()
-        center = face.calc_center_median()
-
-        # Get the average edge vector as reference
-        # ref_edge = (face.verts[1].co - face.verts[0].co).normalized()
-
-        # Check each vertex's plane formed with adjacent vertices
-        for v in face.verts:
-            # Get vectors to adjacent vertices
-            v_pos = v.co - center
-            if v_pos.length < 1e-6:  # Skip if vertex is at center
-                continue
-
-            # Calculate angle between vertex normal and face normal
-            angle = math.acos(min(1.0, max(-1.0, normal.dot(v_pos.normalized()))))
-            if abs(angle - math.pi / 2) > threshold_rad:
-                return False
-
-        return True
-
-    def _is_degenerate(self, face: bmesh.types.BMFace) -> bool:
-        # Check for zero area
-        if face.calc_area() < 1e-8:
-            return True
-
-        # Check for invalid vertex count
-        verts = face.verts
-        if len(verts) < 3:
-            return True
-
-        # Check for duplicate vertices
-        unique_verts = set(vert.co.to_tuple() for vert in verts)
-        if len(unique_verts) < len(verts):
-            return True
-
-        # TODO
-        # Disabled check, as a planar ngon of non zero area is not degenerate
-
-        # # Check all consecutive vertices for collinearity
-        # for i in range(len(verts)):
-        #     v1 = verts[i].co
-        #     v2 = verts[(i + 1) % len(verts)].co
-        #     v3 = verts[(i + 2) % len(verts)].co
-
-        #     # Get vectors between consecutive vertices
-        #     edge1 = (v2 - v1).normalized()
-        #     edge2 = (v3 - v2).normalized()
-
-        #     # Check if vectors are parallel (collinear)
-        #     cross_prod = edge1.cross(edge2)
-        #     if cross_prod.length < 1e-8:
-        #         return True
-
-        return False
+        # Triangles are always planar
+        loop_total = self.get_mesh_array("polygons", "loop_total", np.int32)
+        faces = np.flatnonzero(loop_total > 3)
+        if not len(faces):
+            return faces
+
+        loop_start = self.get_mesh_array("polygons", "loop_start", np.int32)
+        loop_verts = self.get_mesh_array("loops", "vertex_index", np.int32)
+        coords = self.get_mesh_array("vertices", "co", np.float32, 3)
+        face_normals = self.get_mesh_array("polygons", "normal", np.float32, 3)
+
+        # Loops of the candidate faces, laid out face after face
+        totals = loop_total[faces]
+        offsets = np.cumsum(totals) - totals
+        face_of_loop = np.repeat(np.arange(len(faces)), totals)
+        loops = np.arange(totals.sum()) + np.repeat(loop_start[faces] - offsets, totals)
+        points = coords[loop_verts[loops]]
+
+        # Vectors from the face center to each vertex
+        centers = np.add.reduceat(points, offsets, axis=0) / totals[:, None]
+        v_pos = points - centers[face_of_loop]
+        length = np.linalg.norm(v_pos, axis=1)
+        valid = length >= 1e-6  # Skip vertices at the center
+
+        # Angle between the face normal and each center-to-vertex vector
+        dots = np.einsum("ij,ij->i", face_normals[faces[face_of_loop]], v_pos)
+        cos_angle = np.clip(dots / np.where(valid, length, 1.0), -1.0, 1.0)
+        deviates = valid & (np.abs(np.arccos(cos_angle) - math.pi / 2) > threshold_rad)
+
+        return faces[np.logical_or.reduceat(deviates, offsets)]
+
+    def _find_non_manifold_vertices(self) -> np.ndarray:
+        """Indices of vertices failing the BMesh is_manifold test: loose vertices,
+        vertices on wire edges, edges with more than two faces or more than two
+        boundary edges, and vertices whose face corners form several fans"""
+        num_verts = len(self.obj.data.vertices)
+        edge_verts = self.get_mesh_array("edges", "vertices", np.int32, 2)
+        face_count = self._get_edge_face_count()
+
+        # Edge level checks, scattered onto both edge vertices
+        bad_edges = (face_count == 0) | (face_count > 2)
+        non_manifold = self._get_vertex_degree() == 0
+        non_manifold[edge_verts[bad_edges].ravel()] = True
+        boundary = np.bincount(edge_verts[face_count == 1].ravel(), minlength=num_verts)
+        non_manifold |= boundary > 2
+
+        # Face corners (loops) around a vertex are linked through the edges
+        # they share; a manifold vertex has all its corners in a single fan
+        loop_start = self.get_mesh_array("polygons", "loop_start", np.int32)
+        loop_total = self.get_mesh_array("polygons", "loop_total", np.int32)
+        loop_verts = self.get_mesh_array("loops", "vertex_index", np.int32)
+        loop_edges = self.get_mesh_array("loops", "edge_index", np.int32)
+        num_loops = len(loop_verts)
+
+        # Next corner of each face, wrapping the last one to the first
+        next_loop = np.arange(1, num_loops + 1)
+        next_loop[loop_start + loop_total - 1] = loop_start
+
+        # The two loops running along each edge shared by two faces
+        order = np.argsort(loop_edges, kind="stable")
+        first = np.cumsum(face_count) - face_count
+        shared = np.flatnonzero(face_count == 2)
+        loop_a = order[first[shared]]
+        loop_b = order[first[shared] + 1]
+
+        # Each loop holds the corner at its own vertex and, through the next
+        # loop, the corner at the edge's other vertex; pair corners by vertex
+        same_dir = loop_verts[loop_a] == loop_verts[loop_b]
+        links_a = np.concatenate((loop_a, next_loop[loop_a]))
+        links_b = np.concatenate(
+            (
+                np.where(same_dir, loop_b, next_loop[loop_b]),
+                np.where(same_dir, next_loop[loop_b], loop_b),
+            )
+        )
+
+        # Label propagation: every corner ends up labelled with its fan's
+        # lowest corner index
+        labels = np.arange(num_loops)
+        while True:
+            low = np.minimum(labels[links_a], labels[links_b])
+            new_labels = labels.copy()
+            np.minimum.at(new_labels, links_a, low)
+            np.minimum.at(new_labels, links_b, low)
+            new_labels = new_labels[new_labels]
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+
+        fans = np.bincount(
+            loop_verts[labels == np.arange(num_loops)], minlength=num_verts
+        )
+        non_manifold |= fans > 1
+
+        return np.flatnonzero(non_manifold)
+
+    def _find_degenerate_faces(self) -> np.ndarray:
+        """Indices of faces with zero area, too few vertices or duplicate vertices"""
+        loop_start = self.get_mesh_array("polygons", "loop_start", np.int32)
+        loop_total = self.get_mesh_array("polygons", "loop_total", np.int32)
+        area = self.get_mesh_array("polygons", "area", np.float32)
+
+        # Check for zero area and invalid vertex count
+        degenerate = (area < 1e-8) | (loop_total < 3)
+
+        # Check for duplicate vertices, one batch per face size
+        coords = self.get_mesh_array("vertices", "co", np.float32, 3)
+        loop_verts = self.get_mesh_array("loops", "vertex_index", np.int32)
+        for size in np.unique(loop_total[~degenerate]):
+            faces = np.flatnonzero((loop_total == size) & ~degenerate)
+            corners = loop_verts[loop_start[faces, None] + np.arange(size)]
+            # Adding 0.0 folds -0.0 into 0.0 so they compare as duplicates
+            face_coords = np.ascontiguousarray(coords[corners] + 0.0)
+            # Sort each face's points lexicographically, then compare neighbours
+            points = face_coords.view(_POINT_DTYPE).reshape(len(faces), size)
+            points.sort(axis=1)
+            degenerate[faces] = (points[:, 1:] == points[:, :-1]).any(axis=1)
+
+        # Collinearity check disabled, as a planar ngon of non zero area is not degenerate
+
+        return np.flatnonzero(degenerate)
+
+    # Feature id -> analysis function, each returning the matching element indices
+    _MESH_FEATURE_DISPATCH = {
+        **dict.fromkeys(_EDGE_FEATURE_FLAGS, _analyze_edge_feature),
+        **dict.fromkeys(_DEGREE_TESTS, _analyze_degree_feature),
+        **dict.fromkeys(_FACE_SIZE_FEATURES, _analyze_face_size_feature),
+        "degenerate_faces": lambda self, feature: self._find_degenerate_faces(),
+        "non_planar_faces": lambda self, feature: self._find_non_planar_faces(),
+        "non_manifold_v_vertices": lambda self, feature: (
+            self._find_non_manifold_vertices()
+        ),
+    }
 
     @classmethod
     def invalidate_cache(cls, obj_name: str, features: Optional[List[str]] = None):
@@ -245,16 +413,14 @@ class MeshAnalyzer:
             else:
                 # Clear all features
                 analyzer.analyzed_features.clear()
+                analyzer._mesh_arrays.clear()
 
             # Update cache
             cls._cache.put(obj_name, analyzer, analyzer.analyzed_features)
 
     def get_feature_type(self, feature: str) -> str:
         """Return the type of feature: 'VERT', 'EDGE', or 'FACE'"""
-        if feature in self._cache.vertex_features:
-            return "VERT"
-        elif feature in self._cache.edge_features:
-            return "EDGE"
-        elif feature in self._cache.face_features:
-            return "FACE"
-        raise ValueError(f"Unknown feature type: {feature}")
+        try:
+            return FEATURE_TYPES[feature]
+        except KeyError:
+            raise ValueError(f"Unknown feature type: {feature}") from None
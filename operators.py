@@ -2,12 +2,50 @@
 
 import bpy
 import bmesh
+import numpy as np
 
 from .gpu_drawer import GPUDrawer
 from .mesh_analyzer import MeshAnalyzer
 
+# Created on first use, so registering the add-on doesn't build the shader
+drawer = None
 
-drawer = GPUDrawer()
+
+def get_drawer() -> GPUDrawer:
+    global drawer
+    if drawer is None:
+        drawer = GPUDrawer()
+    return drawer
+
+
+def release_drawer():
+    """Stop the drawer and drop it, freeing its GPU batches until next use"""
+    global drawer
+    if drawer is not None:
+        drawer.stop()
+        drawer = None
+
+
+def is_drawer_running() -> bool:
+    """Whether the overlay is shown, without creating the drawer"""
+    return drawer is not None and drawer.is_running
+
+
+def tag_view3d_redraw():
+    """Redraw every 3D viewport"""
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == "VIEW_3D":
+                area.tag_redraw()
+
+
+# (shift, ctrl) -> selection mode, shift takes precedence over ctrl
+_MODIFIER_MODES = {
+    (False, False): "SET",
+    (True, False): "ADD",
+    (True, True): "ADD",
+    (False, True): "SUB",
+}
 
 
 class Mesh_Analysis_Overlay(bpy.types.Operator):
@@ -18,14 +56,12 @@ class Mesh_Analysis_Overlay(bpy.types.Operator):
     )
 
     def execute(self, context):
-        if drawer.is_running:
-            drawer.stop()
+        if is_drawer_running():
+            release_drawer()
         else:
-            drawer.start()
+            get_drawer().start()
 
-        for area in context.screen.areas:
-            if area.type == "VIEW_3D":
-                area.tag_redraw()
+        tag_view3d_redraw()
         return {"FINISHED"}
 
 
@@ -48,12 +84,7 @@ class Select_Feature_Elements(bpy.types.Operator):
     )
 
     def invoke(self, context, event):
-        if event.shift:
-            self.mode = "ADD"
-        elif event.ctrl:
-            self.mode = "SUB"
-        else:
-            self.mode = "SET"
+        self.mode = _MODIFIER_MODES[event.shift, event.ctrl]
         return self.execute(context)
 
     def execute(self, context):
@@ -62,38 +93,76 @@ class Select_Feature_Elements(bpy.types.Operator):
             self.report({"WARNING"}, "No active mesh object")
             return {"CANCELLED"}
 
+        analyzer = MeshAnalyzer.get_analyzer(obj)
+        indices = analyzer.analyze_feature(self.feature)
+        feature_type = analyzer.get_feature_type(self.feature)
+
         if obj.mode != "EDIT":
+            # Write the selection into the mesh in bulk, edit mode loads it as is
+            self.set_mesh_selection(analyzer, feature_type, indices)
+            # Set the select mode directly, the selection is already flushed
+            context.tool_settings.mesh_select_mode = (True, False, False)
             bpy.ops.object.mode_set(mode="EDIT")
-            bpy.ops.mesh.select_mode(type="VERT")
+            return {"FINISHED"}
 
         if self.mode == "SET":
             bpy.ops.mesh.select_all(action="DESELECT")
 
         mesh = obj.data
         bm = bmesh.from_edit_mesh(mesh)
-        bm.faces.ensure_lookup_table()
-        bm.edges.ensure_lookup_table()
-        bm.verts.ensure_lookup_table()
 
-        analyzer = MeshAnalyzer.get_analyzer(obj)
-        indices = analyzer.analyze_feature(self.feature)
-        feature_type = analyzer.get_feature_type(self.feature)
+        # Select elements in the sequence matching the feature type, only that
+        # sequence needs its lookup table
+        elements = {"FACE": bm.faces, "EDGE": bm.edges, "VERT": bm.verts}[feature_type]
+        elements.ensure_lookup_table()
+        select = self.mode != "SUB"
+        get_element = elements.__getitem__
+        # Drop stale indices in one vectorized test instead of per element
+        for idx in indices[indices < len(elements)].tolist():
+            get_element(idx).select = select
+
+        # Flush once for the whole selection, then push it to the viewport
+        # without rebuilding tessellation since only selection changed
+        bm.select_flush_mode()
+        bmesh.update_edit_mesh(mesh, loop_triangles=False, destructive=False)
+
+        return {"FINISHED"}
 
-        # Select elements based on feature type
+    def set_mesh_selection(self, analyzer, feature_type, indices):
+        """Apply the selection to the mesh data with foreach_set in object mode.
+        The feature elements are selected through their vertices and flushed to
+        edges and faces, matching the vertex select mode used in edit mode"""
+        mesh = analyzer.obj.data
+        loop_start = analyzer.get_mesh_array("polygons", "loop_start", np.int32)
+        loop_total = analyzer.get_mesh_array("polygons", "loop_total", np.int32)
+        loop_verts = analyzer.get_mesh_array("loops", "vertex_index", np.int32)
+        edge_verts = analyzer.get_mesh_array("edges", "vertices", np.int32, 2)
+
+        # Vertices of the feature elements
         if feature_type == "FACE":
-            for idx in indices:
-                if idx < len(bm.faces):
-                    bm.faces[idx].select = self.mode != "SUB"
+            face_mask = np.zeros(len(loop_start), dtype=bool)
+            face_mask[indices] = True
+            feature_verts = loop_verts[np.repeat(face_mask, loop_total)]
         elif feature_type == "EDGE":
-            for idx in indices:
-                if idx < len(bm.edges):
-                    bm.edges[idx].select = self.mode != "SUB"
-        elif feature_type == "VERT":
-            for idx in indices:
-                if idx < len(bm.verts):
-                    bm.verts[idx].select = self.mode != "SUB"
+            feature_verts = edge_verts[indices].ravel()
+        else:
+            feature_verts = indices
 
-        return {"FINISHED"}
+        vert_select = np.zeros(len(mesh.vertices), dtype=bool)
+        if self.mode != "SET":
+            mesh.vertices.foreach_get("select", vert_select)
+        vert_select[feature_verts] = self.mode != "SUB"
+
+        # Flush: edges and faces are selected when all their vertices are
+        edge_select = vert_select[edge_verts].all(axis=1)
+        if len(loop_start):
+            face_select = np.logical_and.reduceat(vert_select[loop_verts], loop_start)
+        else:
+            face_select = np.zeros(0, dtype=bool)
+
+        mesh.vertices.foreach_set("select", vert_select)
+        mesh.edges.foreach_set("select", edge_select)
+        mesh.polygons.foreach_set("select", face_select)
 
 
 classes = (
@@ -101,15 +170,13 @@ classes = (
     Select_Feature_Elements,
 )
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
 
 def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
+    _register_classes()
 
 
 def unregister():
-    if drawer:
-        drawer.stop()
-
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
+    release_drawer()
+    _unregister_classes()
@@ -2,9 +2,69 @@
 
 import bpy
 
-from .operators import drawer
+from collections import OrderedDict
+from .operators import is_drawer_running, tag_view3d_redraw
 from .mesh_analyzer import MeshAnalyzer
-from .feature_data import FEATURE_DATA
+from .feature_data import FEATURE_DATA, FEATURE_PROPS
+
+# Feature row split between the toggle and its color/select buttons
+SPLIT_FACTOR = 0.85
+
+# Operator and icon of the per-feature select button
+SELECT_OPERATOR = "view3d.select_feature_elements"
+SELECT_ICON = "RESTRICT_SELECT_OFF"
+
+# (text, icon) of the info rows shown under the overlay toggle
+INFO_ROWS = (
+    ("Overlay data is cached.", "INFO"),
+    ("Refresh by:", "NONE"),
+    ("• Toggling Overlay off/on", "NONE"),
+    ("• Toggling Edit Mode off/on", "NONE"),
+)
+INFO_ROW_SCALE = 0.5
+
+# (panel id, title, feature rows) per category, with each row as
+# (feature id, enabled property, color property, label), built once
+FEATURE_PANELS = tuple(
+    (
+        f"{category}_panel",
+        category.title(),
+        tuple(
+            (feature["id"], *FEATURE_PROPS[feature["id"]], feature["label"])
+            for feature in features
+        ),
+    )
+    for category, features in FEATURE_DATA.items()
+)
+
+# Feature id -> statistics row label, e.g. "tri_faces" -> "Tri Faces"
+STATS_LABELS = {
+    feature["id"]: feature["id"].replace("_", " ").title()
+    for features in FEATURE_DATA.values()
+    for feature in features
+}
+
+# Seconds between statistics updates while objects are queued
+STATS_INTERVAL = 0.25
+
+# Number of meshes whose statistics are kept
+STATS_CACHE_SIZE = 64
+
+# (property, label) of the overlay settings rows
+SETTINGS_ROWS = (
+    ("overlay_offset", "Overlay Offset"),
+    ("overlay_edge_width", "Overlay Edge Width"),
+    ("overlay_vertex_radius", "Overlay Vertex Radius"),
+    ("non_planar_threshold", "Non-Planar Threshold"),
+)
+
+
+def draw_feature_row(layout, props, feature_id, enabled_prop, color_prop, label):
+    """Feature toggle, color and select button on one split row"""
+    split = layout.row(align=True).split(factor=SPLIT_FACTOR)
+    split.prop(props, enabled_prop, text=label)
+    split.prop(props, color_prop, text="")
+    split.operator(SELECT_OPERATOR, text="", icon=SELECT_ICON).feature = feature_id
 
 
 class Mesh_Analysis_Overlay_Panel(bpy.types.Panel):
@@ -13,18 +73,68 @@ class Mesh_Analysis_Overlay_Panel(bpy.types.Panel):
     bl_space_type = "VIEW_3D"
     bl_region_type = "UI"
     bl_category = "Mesh Analysis Overlay"
+    bl_options = {"DEFAULT_CLOSED"}
 
-    _stats_cache = {}  # Class variable to store statistics
+    # {mesh_name: (key, statistics)}, ordered from least to most recently
+    # drawn. Keyed by mesh so counts survive object renames and are shared by
+    # objects using the same mesh
+    _stats_cache = OrderedDict()
 
     @classmethod
     def clear_stats_cache(cls):
         """Clear the statistics cache"""
         cls._stats_cache.clear()
 
+    @staticmethod
+    def stats_key(obj, props) -> tuple:
+        """Cached counts are reused while the mesh, the enabled features and
+        the non-planar threshold stay the same"""
+        mesh = obj.data
+        active_features = tuple(
+            feature_id
+            for _, _, rows in FEATURE_PANELS
+            for feature_id, enabled_prop, _, _ in rows
+            if getattr(props, enabled_prop, False)
+        )
+        return (
+            mesh.as_pointer(),
+            len(mesh.vertices),
+            len(mesh.edges),
+            len(mesh.polygons),
+            props.non_planar_threshold,
+            active_features,
+        )
+
+    @classmethod
+    def update_stats(cls, obj, props):
+        """Count the enabled features of the object and cache the result"""
+        key = cls.stats_key(obj, props)
+        active_features = key[-1]
+        analyzer = MeshAnalyzer.get_analyzer(obj)
+        stats = {"mode": obj.mode, "features": []}
+
+        # Ready to draw (title, ((label, count), ...)) groups, in FEATURE_DATA
+        # order, skipping categories without enabled features
+        for _, title, rows in FEATURE_PANELS:
+            counts = tuple(
+                (
+                    STATS_LABELS[feature_id],
+                    str(len(analyzer.analyze_feature(feature_id))),
+                )
+                for feature_id, _, _, _ in rows
+                if feature_id in active_features
+            )
+            if counts:
+                stats["features"].append((f"{title}:", counts))
+
+        cls._stats_cache[obj.data.name] = (key, stats)
+        cls._stats_cache.move_to_end(obj.data.name)
+        if len(cls._stats_cache) > STATS_CACHE_SIZE:
+            cls._stats_cache.popitem(last=False)
+
     def draw(self, context):
         layout = self.layout
         props = context.scene.Mesh_Analysis_Overlay_Properties
-        factor = 0.85
 
         # Toggle button for overlay
         row = layout.row()
@@ -32,47 +142,27 @@ class Mesh_Analysis_Overlay_Panel(bpy.types.Panel):
             "view3d.mesh_analysis_overlay",
             text="Show Mesh Overlay",
             icon="OVERLAY",
-            depress=drawer.is_running,
+            depress=is_drawer_running(),
         )
 
         # Info text
-        ROW_SCALE = 0.5
-        ALIGNMENT = "LEFT"
-        row = layout.row()
-        row.scale_y = ROW_SCALE
-        row.alignment = ALIGNMENT
-        row.label(text="Overlay data is cached.", icon="INFO")
-        row = layout.row()
-        row.scale_y = ROW_SCALE
-        row.alignment = ALIGNMENT
-        row.label(text="Refresh by:")
-        row = layout.row()
-        row.scale_y = ROW_SCALE
-        row.alignment = ALIGNMENT
-        row.label(text="• Toggling Overlay off/on")
-        row = layout.row()
-        row.scale_y = ROW_SCALE
-        row.alignment = ALIGNMENT
-        row.label(text="• Toggling Edit Mode off/on")
+        col = layout.column(align=True)
+        col.scale_y = INFO_ROW_SCALE
+        col.alignment = "LEFT"
+        for text, icon in INFO_ROWS:
+            col.label(text=text, icon=icon)
 
         # Draw feature panels
-        for category, features in FEATURE_DATA.items():
-            header, panel = layout.panel(f"{category}_panel", default_closed=False)
-            header.label(text=category.title())
+        for panel_id, title, rows in FEATURE_PANELS:
+            header, panel = layout.panel(panel_id, default_closed=False)
+            header.label(text=title)
             if panel:
-                for feature in features:
-                    row = panel.row(align=True)
-                    split = row.split(factor=factor)
-                    split.prop(props, f"{feature['id']}_enabled", text=feature["label"])
-                    split.prop(props, f"{feature['id']}_color", text="")
-                    split.operator(
-                        "view3d.select_feature_elements",
-                        text="",
-                        icon="RESTRICT_SELECT_OFF",
-                    ).feature = feature["id"]
+                col = panel.column(align=True)
+                for row in rows:
+                    draw_feature_row(col, props, *row)
 
         # Statistics panel
-        header, panel = layout.panel("statistics_panel", default_closed=False)
+        header, panel = layout.panel("statistics_panel", default_closed=True)
         header.label(text="Statistics")
 
         if panel:
@@ -83,15 +173,13 @@ class Mesh_Analysis_Overlay_Panel(bpy.types.Panel):
         header.label(text="Overlay Settings")
 
         if panel:
-            panel.prop(props, "overlay_offset", text="Overlay Offset")
-            panel.prop(props, "overlay_edge_width", text="Overlay Edge Width")
-            panel.prop(props, "overlay_vertex_radius", text="Overlay Vertex Radius")
-            panel.prop(props, "non_planar_threshold", text="Non-Planar Threshold")
+            for prop_name, text in SETTINGS_ROWS:
+                panel.prop(props, prop_name, text=text)
 
     def draw_statistics(self, context, panel):
         """Draw statistics using cached values when possible"""
         if not (
-            drawer.is_running
+            is_drawer_running()
             and context.active_object
             and context.active_object.type == "MESH"
         ):
@@ -101,53 +189,65 @@ class Mesh_Analysis_Overlay_Panel(bpy.types.Panel):
         obj = context.active_object
         props = context.scene.Mesh_Analysis_Overlay_Properties
 
-        # Get cached stats or calculate new ones
-        if obj.name not in self._stats_cache:
-            analyzer = MeshAnalyzer.get_analyzer(obj)
-            stats = {"mode": context.mode, "features": {}}
-
-            # Use FEATURE_DATA order for consistency
-            for category, features in FEATURE_DATA.items():
-                active_features = [
-                    feature["id"]
-                    for feature in features
-                    if getattr(props, f"{feature['id']}_enabled", False)
-                ]
-                if active_features:
-                    stats["features"][category.title()] = {
-                        feature: len(analyzer.analyze_feature(feature))
-                        for feature in active_features
-                    }
-
-            self._stats_cache[obj.name] = stats
+        # Counts are computed by a timer outside of the redraw, draw a
+        # placeholder until they are ready
+        cached = self._stats_cache.get(obj.data.name)
+        if cached is None or cached[0] != self.stats_key(obj, props):
+            _pending_stats.add(obj.name)
+            if not bpy.app.timers.is_registered(_update_pending_stats):
+                bpy.app.timers.register(_update_pending_stats, first_interval=0.0)
+            panel.label(text="Computing statistics...")
+            return
 
         # Draw statistics from cache
-        stats = self._stats_cache[obj.name]
+        self._stats_cache.move_to_end(obj.data.name)
+        stats = cached[1]
+        if not stats["features"]:
+            panel.label(text="No overlay enabled")
+            return
+
         box = panel.box()
 
-        # Draw in same order as FEATURE_DATA
-        for category in FEATURE_DATA.keys():
-            category_title = category.title()
-            if (
-                category_title in stats["features"]
-                and stats["features"][category_title]
-            ):
-                col = box.column(align=True)
-                col.label(text=f"{category_title}:")
-                for feature_name, count in stats["features"][category_title].items():
-                    row = col.row()
-                    row.label(text=feature_name.replace("_", " ").title())
-                    row.label(text=str(count))
+        for title, counts in stats["features"]:
+            col = box.column(align=True)
+            col.label(text=title)
+            for label, count in counts:
+                row = col.row()
+                row.label(text=label)
+                row.label(text=count)
+
+
+# Names of objects waiting for their statistics to be computed
+_pending_stats = set()
+
+
+def _update_pending_stats():
+    """Timer computing queued statistics one object per tick, so the panel
+    redraw never runs the analysis itself"""
+    if _pending_stats:
+        obj = bpy.data.objects.get(_pending_stats.pop())
+        if obj and obj.type == "MESH":
+            props = bpy.context.scene.Mesh_Analysis_Overlay_Properties
+            Mesh_Analysis_Overlay_Panel.update_stats(obj, props)
+
+            # Redraw the sidebar showing the placeholder
+            tag_view3d_redraw()
+
+    return STATS_INTERVAL if _pending_stats else None
 
 
 classes = (Mesh_Analysis_Overlay_Panel,)
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
 
 def register():
-    for bl_class in classes:
-        bpy.utils.register_class(bl_class)
+    _register_classes()
 
 
 def unregister():
-    for bl_class in reversed(classes):
-        bpy.utils.unregister_class(bl_class)
+    if bpy.app.timers.is_registered(_update_pending_stats):
+        bpy.app.timers.unregister(_update_pending_stats)
+    _pending_stats.clear()
+
+    _unregister_classes()
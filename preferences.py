@@ -20,12 +20,4 @@ class MeshAnalysisOverlayPreferences(AddonPreferences):
 
 classes = (MeshAnalysisOverlayPreferences,)
 
-
-def register():
-    for bl_class in classes:
-        bpy.utils.register_class(bl_class)
-
-
-def unregister():
-    for bl_class in reversed(classes):
-        bpy.utils.unregister_class(bl_class)
+register, unregister = bpy.utils.register_classes_factory(classes)
@@ -4,31 +4,30 @@ import bpy
 from bpy.props import BoolProperty, FloatVectorProperty, FloatProperty
 from bpy.types import PropertyGroup
 from . import handlers
-from .feature_data import FEATURE_DATA
+from .feature_data import FEATURE_DATA, FEATURE_PROPS
 
 
 class Mesh_Analysis_Overlay_Props(PropertyGroup):
     # Dynamically create properties from FEATURE_DATA
     for category, features in FEATURE_DATA.items():
         for feature in features:
-            exec(
-                f"""
-{feature['id']}_enabled: BoolProperty(
-    name="Show {feature['label']}",
-    description="{feature['description']}",
-    default=False,
-    update=handlers.update_overlay_enabled_toggles,
-)
-{feature['id']}_color: FloatVectorProperty(
-    name="{feature['label']} Color",
-    subtype="COLOR",
-    default={feature['default_color']},
-    size=4,
-    min=0.0,
-    max=1.0,
-)
-"""
+            enabled_prop, color_prop = FEATURE_PROPS[feature["id"]]
+            __annotations__[enabled_prop] = BoolProperty(
+                name=f"Show {feature['label']}",
+                description=feature["description"],
+                default=False,
+                update=handlers.update_overlay_enabled_toggles,
             )
+            __annotations__[color_prop] = FloatVectorProperty(
+                name=f"{feature['label']} Color",
+                subtype="COLOR",
+                default=feature["default_color"],
+                size=4,
+                min=0.0,
+                max=1.0,
+                update=handlers.update_overlay_color,
+            )
+    del category, features, feature, enabled_prop, color_prop
 
     # SETTINGS VALUES
     overlay_offset: FloatProperty(
@@ -67,14 +66,16 @@ class Mesh_Analysis_Overlay_Props(PropertyGroup):
 classes = (Mesh_Analysis_Overlay_Props,)
 
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
+
 def register():
-    for bl_class in classes:
-        bpy.utils.register_class(bl_class)
+    _register_classes()
     bpy.types.Scene.Mesh_Analysis_Overlay_Properties = bpy.props.PointerProperty(
         type=Mesh_Analysis_Overlay_Props
     )
 
 
 def unregister():
-    bpy.utils.unregister_class(Mesh_Analysis_Overlay_Props)
     del bpy.types.Scene.Mesh_Analysis_Overlay_Properties
+    _unregister_classes()